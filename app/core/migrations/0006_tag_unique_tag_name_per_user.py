@@ -0,0 +1,52 @@
+# Generated by Django 3.2.25 on 2026-10-14 05:05
+
+from django.db import migrations, models
+from django.db.models import Count, Min
+
+
+def merge_duplicate_tags(apps, schema_editor):
+    """Fold tags sharing a user and name into the oldest one.
+
+    Items linked to a duplicate are linked to the surviving tag before
+    the duplicate, and with it its through rows, is deleted.
+    """
+    Tag = apps.get_model('core', 'Tag')
+    ItemTag = apps.get_model('core', 'Item').tags.through
+    duplicates = Tag.objects.values('user_id', 'name').annotate(
+        survivor_id=Min('id'),
+        tag_count=Count('id'),
+    ).filter(tag_count__gt=1)
+    for group in duplicates:
+        survivor_id = group['survivor_id']
+        extra_ids = list(Tag.objects.filter(
+            user_id=group['user_id'],
+            name=group['name'],
+        ).exclude(id=survivor_id).values_list('id', flat=True))
+        linked = ItemTag.objects.filter(tag_id=survivor_id).values('item_id')
+        item_ids = set(ItemTag.objects.filter(
+            tag_id__in=extra_ids,
+        ).exclude(item_id__in=linked).values_list('item_id', flat=True))
+        ItemTag.objects.bulk_create([
+            ItemTag(item_id=item_id, tag_id=survivor_id)
+            for item_id in item_ids
+        ])
+        Tag.objects.filter(id__in=extra_ids).delete()
+
+    # Run the deferred foreign key checks now; Postgres refuses to alter
+    # core_tag while they are pending in the same transaction.
+    schema_editor.execute('SET CONSTRAINTS ALL IMMEDIATE')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_item_image'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicate_tags, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='tag',
+            constraint=models.UniqueConstraint(fields=('user', 'name'), name='unique_tag_name_per_user'),
+        ),
+    ]
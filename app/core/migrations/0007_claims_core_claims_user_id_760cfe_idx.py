@@ -0,0 +1,17 @@
+# Generated by Django 3.2.25 on 2026-10-14 05:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_tag_unique_tag_name_per_user'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='claims',
+            index=models.Index(fields=['user', 'item'], name='core_claims_user_id_760cfe_idx'),
+        ),
+    ]
@@ -0,0 +1,61 @@
+# Generated by Django 3.2.25 on 2026-10-14 06:10
+
+from django.db import migrations, models
+from django.db.models.functions import Lower, Trim
+
+
+STATUS_VALUES = {'lost': 0, 'found': 1}
+
+
+def status_to_integer(apps, schema_editor):
+    """Map the stored status labels onto the integer choices.
+
+    The old column was free text, so labels are compared trimmed and
+    case-insensitively; any other value aborts the migration instead of
+    silently becoming the default.
+    """
+    Item = apps.get_model('core', 'Item')
+    items = Item.objects.annotate(status_label=Lower(Trim('status')))
+    unknown = items.exclude(status_label__in=STATUS_VALUES).values_list(
+        'status', flat=True,
+    ).distinct()
+    if unknown:
+        raise ValueError(
+            'Cannot convert item status values: '
+            + ', '.join(repr(status) for status in unknown)
+        )
+
+    for label, value in STATUS_VALUES.items():
+        items.filter(status_label=label).update(status_code=value)
+
+
+def status_to_label(apps, schema_editor):
+    """Map the integer choices back onto status labels."""
+    Item = apps.get_model('core', 'Item')
+    for label, value in STATUS_VALUES.items():
+        Item.objects.filter(status_code=value).update(status=label)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_claims_core_claims_user_id_760cfe_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='item',
+            name='status_code',
+            field=models.SmallIntegerField(choices=[(0, 'lost'), (1, 'found')], default=0),
+        ),
+        migrations.RunPython(status_to_integer, status_to_label),
+        migrations.RemoveField(
+            model_name='item',
+            name='status',
+        ),
+        migrations.RenameField(
+            model_name='item',
+            old_name='status_code',
+            new_name='status',
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 3.2.25 on 2026-10-14 05:22
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_item_status_integer'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddIndex(
+            model_name='item',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['description'], name='item_description_trgm', opclasses=['gin_trgm_ops']),
+        ),
+    ]
@@ -2,10 +2,10 @@
 
 Database models.
 """
-import uuid
-import os
+import secrets
 
 from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex
 from django.db import models
 from django.contrib.auth.models import (
     AbstractBaseUser,
@@ -14,12 +14,15 @@ from django.contrib.auth.models import (
 )
 
 
+ITEM_IMAGE_DIR = 'uploads/item/'
+
+
 def item_image_file_path(instance, filename):
     """Generate file path for new item image"""
-    ext = os.path.splitext(filename)[1]
-    filename = f'{uuid.uuid4()}{ext}'
+    dot = filename.rfind('.')
+    ext = filename[dot:] if dot > 0 else ''
 
-    return os.path.join('uploads', 'item', filename)
+    return f'{ITEM_IMAGE_DIR}{secrets.token_hex(16)}{ext}'
 
 
 class UserManager(BaseUserManager):
@@ -59,19 +62,36 @@ class User(AbstractBaseUser, PermissionsMixin):
 
 class Item(models.Model):
     """Item Object"""
+
+    class Status(models.IntegerChoices):
+        LOST = 0, 'lost'
+        FOUND = 1, 'found'
+
     user = models.ForeignKey(
             settings.AUTH_USER_MODEL,
             on_delete=models.CASCADE,
         )
     title = models.CharField(max_length=255)
     description = models.TextField(blank=True)
-    status = models.CharField(max_length=10, default='lost')
+    status = models.SmallIntegerField(
+        choices=Status.choices,
+        default=Status.LOST,
+    )
     category = models.CharField(max_length=20)
     location_last_seen = models.CharField(max_length=255)
     date_lost = models.DateField()
     tags = models.ManyToManyField('Tag')
     image = models.ImageField(null=True, upload_to=item_image_file_path)
 
+    class Meta:
+        indexes = [
+            GinIndex(
+                name='item_description_trgm',
+                fields=['description'],
+                opclasses=['gin_trgm_ops'],
+            ),
+        ]
+
     def __str__(self):
         return self.title
 
@@ -84,6 +104,14 @@ class Tag(models.Model):
         on_delete=models.CASCADE,
     )
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'name'],
+                name='unique_tag_name_per_user',
+            ),
+        ]
+
     def __str__(self):
         return self.name
 
@@ -102,5 +130,10 @@ class Claims(models.Model):
     status = models.CharField(max_length=10,choices=CLAIM_STATUS_CHOICES, default='pending')
     description = models.TextField(blank=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'item']),
+        ]
+
     def __str__(self):
         return str(self.item)
\ No newline at end of file
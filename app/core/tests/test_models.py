@@ -3,7 +3,7 @@ Tests for models
 """
 from unittest.mock import patch
 from datetime import date
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.contrib.auth import get_user_model
 
 from core import models
@@ -18,6 +18,9 @@ def create_user(email="user@example.com", password='testpass123'):
 class ModelTests(TestCase):
     """Test Models"""
 
+    @override_settings(PASSWORD_HASHERS=[
+        'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+    ])
     def test_create_user_with_email_successful(self):
         """Test creating a user eith an email is successful"""
         email = 'test@example.com'
@@ -63,7 +66,7 @@ class ModelTests(TestCase):
             'test@example.com'
             'testpass123'
         )
-        lost_status = 'lost'
+        lost_status = models.Item.Status.LOST
         item_category = 'electronics'
         item = models.Item.objects.create(
             user=user,
@@ -88,7 +91,7 @@ class ModelTests(TestCase):
     def test_create_claim(self):
         """Test creating a claim is successful"""
         user = create_user()
-        lost_status= 'found'
+        lost_status = models.Item.Status.FOUND
         item_category='Jewellry'
         item = models.Item.objects.create(
             user=user,
@@ -112,11 +115,11 @@ class ModelTests(TestCase):
         self.assertEqual(claim.status, 'pending')
         self.assertEqual(claim.description, 'This is a test claim')
 
-    @patch('core.models.uuid.uuid4')
-    def test_item_file_name__uuid(self, mock_uuid):
+    @patch('core.models.secrets.token_hex')
+    def test_item_file_name_token(self, mock_token_hex):
         """Test generating image path."""
-        uuid = 'test-uuid'
-        mock_uuid.return_value = uuid
+        token = 'test-token'
+        mock_token_hex.return_value = token
         file_path = models.item_image_file_path(None, 'example.jpg')
 
-        self.assertEqual(file_path, f'uploads/item/{uuid}.jpg')
+        self.assertEqual(file_path, f'uploads/item/{token}.jpg')
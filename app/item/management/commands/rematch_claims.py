@@ -0,0 +1,39 @@
+"""
+Django command to rematch pending claims to items
+"""
+from django.core.management.base import BaseCommand
+from django.db.models.functions import Lower
+
+from core.models import Claims, Item
+from item.matching import match_claims_to_items
+
+
+class Command(BaseCommand):
+    """Django command to relink pending claims to their best item.
+
+    Claim creation only scores the trigram shortlist, but this command
+    scores every item. That lets it correct claims whose best item was
+    left out of the shortlist. Ties go to the oldest item.
+    """
+
+    def handle(self, *args, **options):
+        """Entry point for command"""
+        claims = list(
+            Claims.objects.filter(status='pending')
+            .only('id', 'item_id')
+            .annotate(description_lc=Lower('description'))
+        )
+        items = Item.objects.only('id').annotate(
+            description_lc=Lower('description'),
+        ).order_by('id')
+
+        changed = []
+        for claim, item in zip(claims, match_claims_to_items(claims, items)):
+            if item is not None and item.id != claim.item_id:
+                claim.item_id = item.id
+                changed.append(claim)
+        Claims.objects.bulk_update(changed, ['item'], batch_size=500)
+
+        self.stdout.write(
+            self.style.SUCCESS(f'Rematched {len(changed)} claims.')
+        )
@@ -0,0 +1,54 @@
+"""
+Matching claims to items
+"""
+from rapidfuzz import fuzz, process
+
+
+def match_claim_to_item(claim, items):
+    """Match claim to item based on description
+
+    The claim and the items must carry a lowercased description as
+    ``description_lc``, computed by the database through Lower() so
+    both sides are folded the same way as in match_claims_to_items.
+    """
+    items = list(items)
+    match = process.extractOne(
+        claim.description_lc,
+        [item.description_lc for item in items],
+        scorer=fuzz.ratio,
+        processor=None,
+        score_cutoff=60,
+    )
+    if match is None:
+        return None
+
+    return items[match[2]]
+
+
+def match_claims_to_items(claims, items, chunk_size=100):
+    """Return the best matching item for each claim, or None
+
+    Claims and items must both carry ``description_lc``. Every claim in
+    a chunk is scored against every item in one native cdist call.
+    """
+    items = list(items)
+    choices = [item.description_lc for item in items]
+    claims = list(claims)
+    if not choices:
+        return [None] * len(claims)
+
+    matches = []
+    for start in range(0, len(claims), chunk_size):
+        chunk = claims[start:start + chunk_size]
+        scores = process.cdist(
+            [claim.description_lc for claim in chunk],
+            choices,
+            scorer=fuzz.ratio,
+            processor=None,
+            score_cutoff=60,
+            workers=-1,
+        )
+        for row, best in zip(scores, scores.argmax(axis=1)):
+            matches.append(items[best] if row[best] else None)
+
+    return matches
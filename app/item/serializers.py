@@ -2,6 +2,8 @@
 Serializers for item API
 """
 
+from django.db.models import prefetch_related_objects
+
 from rest_framework import serializers
 
 from core.models import (
@@ -19,25 +21,96 @@ class TagSerializer(serializers.ModelSerializer):
         fields = ['id', 'name']
         read_only_fields = ['id']
 
+    def validate_name(self, value):
+        """Reject renaming a tag to a name the user already has."""
+        if self.instance is not None and Tag.objects.filter(
+            user_id=self.instance.user_id,
+            name=value,
+        ).exclude(id=self.instance.id).exists():
+            raise serializers.ValidationError('Tag already exists.')
+
+        return value
+
+
+def get_or_create_tags(user, names):
+    """Return the user's tags with the given names, creating missing ones."""
+    existing = set(Tag.objects.filter(
+        user=user,
+        name__in=names,
+    ).values_list('name', flat=True))
+    missing = set(names) - existing
+    if missing:
+        Tag.objects.bulk_create(
+            [Tag(user=user, name=name) for name in missing],
+            ignore_conflicts=True,
+        )
+
+    return list(Tag.objects.filter(user=user, name__in=names))
+
+
+class ItemListSerializer(serializers.ListSerializer):
+    """Serializer for creating several items in one request"""
+
+    def create(self, validated_data):
+        """Create the items and link their tags in bulk"""
+        item_tags = [
+            {tag['name'] for tag in attrs.pop('tags', [])}
+            for attrs in validated_data
+        ]
+        items = Item.objects.bulk_create(
+            [Item(**attrs) for attrs in validated_data]
+        )
+
+        names = set().union(*item_tags)
+        if names:
+            auth_user = self.context['request'].user
+            tag_ids = {
+                tag.name: tag.id
+                for tag in get_or_create_tags(auth_user, names)
+            }
+            through = Item.tags.through
+            through.objects.bulk_create([
+                through(item_id=item.id, tag_id=tag_ids[name])
+                for item, tag_names in zip(items, item_tags)
+                for name in tag_names
+            ])
+        prefetch_related_objects(items, 'tags')
+
+        return items
+
+
+class ItemStatusField(serializers.ChoiceField):
+    """Item status exposed by its label rather than the stored integer"""
+    values = {label: value for value, label in Item.Status.choices}
+
+    def __init__(self, **kwargs):
+        super().__init__(choices=list(self.values), **kwargs)
+
+    def to_internal_value(self, data):
+        return self.values[super().to_internal_value(data)]
+
+    def to_representation(self, value):
+        return Item.Status(value).label
+
 
 class ItemSerializer(serializers.ModelSerializer):
     """Serializer for items"""
+    status = ItemStatusField(required=False)
     tags = TagSerializer(many=True, required=False)
 
     class Meta:
         model = Item
+        list_serializer_class = ItemListSerializer
         fields = ['id', 'title', 'description', 'status', 'category', 'location_last_seen', 'date_lost', 'tags']
         read_only_fields = ['id']
 
     def _get_or_create_tags(self, tags, item):
         """Handle getting or creating tags as needed"""
+        if not tags:
+            return
         auth_user = self.context['request'].user
-        for tag in tags:
-            tag_obj, created = Tag.objects.get_or_create(
-                user=auth_user,
-                **tag,
-            )
-            item.tags.add(tag_obj)
+        names = {tag['name'] for tag in tags}
+        item.tags.add(*get_or_create_tags(auth_user, names))
 
     def create(self, validated_data):
         """Creat an item"""
@@ -51,8 +124,17 @@ class ItemSerializer(serializers.ModelSerializer):
         """Update item"""
         tags = validated_data.pop('tags', None)
         if tags is not None:
-            instance.tags.clear()
-            self._get_or_create_tags(tags, instance)
+            names = {tag['name'] for tag in tags}
+            current = {tag.name: tag for tag in instance.tags.all()}
+            removed = [
+                tag for name, tag in current.items() if name not in names
+            ]
+            if removed:
+                instance.tags.remove(*removed)
+            self._get_or_create_tags(
+                [{'name': name} for name in names - current.keys()],
+                instance,
+            )
 
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
@@ -69,14 +151,12 @@ class ItemDetailSerializer(ItemSerializer):
 
 
 class ClaimsSerializer(serializers.ModelSerializer):
-    item = serializers.SlugRelatedField(
-        queryset=Item.objects.all(),
-        slug_field = 'title'
-    )
+    item = serializers.PrimaryKeyRelatedField(queryset=Item.objects.all())
+    item_title = serializers.CharField(source='item.title', read_only=True)
 
     class Meta:
         model = Claims
-        fields = ['id','item', 'user', 'status','description' ]
+        fields = ['id', 'item', 'item_title', 'user', 'status', 'description']
         read_only_fields = ['user']
 
 
@@ -3,19 +3,26 @@ Test for item api
 """
 import tempfile
 import os
+import shutil
+
+from functools import lru_cache
+from unittest.mock import patch
 
 from PIL import Image
 from datetime import date
 
+from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.test import TestCase
-from django.urls import reverse
+from django.test import TestCase, override_settings
+from django.urls import reverse, reverse_lazy
 
 from rest_framework import status
+from rest_framework.pagination import PageNumberPagination
 from rest_framework.test import APIClient
 
 
 from core.models import (
+    Claims,
     Item,
     Tag,
 )
@@ -25,9 +32,10 @@ from item.serializers import(
     ItemSerializer,
     ItemDetailSerializer,
 )
+from item.views import ItemViewSet
 
 
-ITEMS_URL = reverse('item:item-list')
+ITEMS_URL = reverse_lazy('item:item-list')
 
 
 def image_upload_url(item_id):
@@ -35,25 +43,32 @@ def image_upload_url(item_id):
     return reverse('item:item-upload-image', args=[item_id])
 
 
+@lru_cache(maxsize=1024)
 def detail_url(item_id):
     """Create and Return a item detail URL"""
     return reverse('item:item-detail', args=[item_id])
 
 
-def create_item(user, **params):
-    """Create and return a sample recipe."""
+def create_items(user, n=1, **params):
+    """Create and return n sample items with a single INSERT."""
     defaults = {
         'title': 'Item name',
         'description': 'A simple description',
-        'status': 'lost',
+        'status': Item.Status.LOST,
         'category': 'Unknown',
         'location_last_seen': 'Unknown',
         'date_lost':date.today(),
     }
     defaults.update(params)
 
-    item = Item.objects.create(user=user, **defaults)
-    return item
+    return Item.objects.bulk_create(
+        [Item(user=user, **defaults) for _ in range(n)]
+    )
+
+
+def create_item(user, **params):
+    """Create and return a sample recipe."""
+    return create_items(user, **params)[0]
 
 
 def create_user(**params):
@@ -77,15 +92,17 @@ class PublicItemAPITests(TestCase):
 class PrivateItemAPITests(TestCase):
     """Test authenticated API requests."""
 
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user(email='user@example.com', password='test123')
+
     def setUp(self):
         self.client = APIClient()
-        self.user = create_user(email='user@example.com', password='test123')
         self.client.force_authenticate(self.user)
 
     def test_retrieve_items(self):
         """Test for retrieving items."""
-        create_item(user=self.user)
-        create_item(user=self.user)
+        create_items(user=self.user, n=2)
 
         res = self.client.get(ITEMS_URL)
 
@@ -94,6 +111,33 @@ class PrivateItemAPITests(TestCase):
         self.assertEqual(res.status_code, status.HTTP_200_OK)
         self.assertEqual(res.data, serializer.data)
 
+    def test_retrieve_items_tags_fetched_once(self):
+        """Test listing items does not query tags per item."""
+        tag = Tag.objects.create(user=self.user, name='Electronics')
+        for item in create_items(user=self.user, n=3):
+            item.tags.add(tag)
+
+        with self.assertNumQueries(2):
+            res = self.client.get(ITEMS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data), 3)
+
+    def test_retrieve_items_paginated(self):
+        """Test item list honours a configured pagination class"""
+        class ItemPagination(PageNumberPagination):
+            page_size = 2
+
+        create_items(user=self.user, n=3)
+
+        with patch.object(ItemViewSet, 'pagination_class', ItemPagination):
+            res = self.client.get(ITEMS_URL)
+
+        items = Item.objects.all().order_by('-id')[:2]
+        serializer = ItemSerializer(items, many=True)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['count'], 3)
+        self.assertEqual(res.data['results'], serializer.data)
 
     def test_item_list_limited_to_user(self):
         """Test list of recipies is limited to authenticated user"""
@@ -119,6 +163,20 @@ class PrivateItemAPITests(TestCase):
         serializer = ItemDetailSerializer(item)
         self.assertEqual(res.data, serializer.data)
 
+    def test_get_item_detail_tags_prefetched(self):
+        """Test item detail reads its tags from the prefetch"""
+        item = create_item(user=self.user)
+        item.tags.add(
+            Tag.objects.create(user=self.user, name='Electronics'),
+            Tag.objects.create(user=self.user, name='Phone'),
+        )
+
+        with self.assertNumQueries(2):
+            res = self.client.get(detail_url(item.id))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data['tags']), 2)
+
     def test_create_item(self):
         """test creating an item"""
         payload = {
@@ -132,10 +190,12 @@ class PrivateItemAPITests(TestCase):
         res = self.client.post(ITEMS_URL, payload)
 
         self.assertEqual(res.status_code, status.HTTP_201_CREATED)
-        item = Item.objects.get(id=res.data['id'])
         for k, v in payload.items():
-            self.assertEqual(getattr(item, k), v)
-        self.assertEqual(item.user, self.user)
+            if isinstance(v, date):
+                v = v.isoformat()
+            self.assertEqual(res.data[k], v)
+        item = Item.objects.only('user_id').get(id=res.data['id'])
+        self.assertEqual(item.user_id, self.user.id)
 
     def test_partial_update_status(self):
         """Test partial update of an item's status"""
@@ -143,29 +203,40 @@ class PrivateItemAPITests(TestCase):
             user=self.user,
             title='Lost Item',
             description='A lost airpod',
-            status='lost',
+            status=Item.Status.LOST,
             category='electronics',
             location_last_seen= 'Around G block',
             date_lost=date.today()
         )
 
         payload = {'status': 'found'}
-        url = reverse('item:item-detail', args=[item.id])
+        url = detail_url(item.id)
         res = self.client.patch(url, payload)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
         item.refresh_from_db()
         updated_item = Item.objects.get(id=item.id)
-        self.assertEqual(updated_item.status, 'found')
+        self.assertEqual(updated_item.status, Item.Status.FOUND)
         self.assertEqual(updated_item.title, 'Lost Item')
 
+    def test_invalid_status_rejected(self):
+        """Test updating an item with an unknown status returns an error"""
+        item = create_item(user=self.user)
+
+        payload = {'status': 'stolen'}
+        res = self.client.patch(detail_url(item.id), payload)
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        item.refresh_from_db()
+        self.assertEqual(item.status, Item.Status.LOST)
+
     def test_full_update(self):
         """test full update of recipe"""
         item = create_item(
             user=self.user,
             title='Lost Item',
             description='A lost airpod',
-            status='lost',
+            status=Item.Status.LOST,
             category='electronics',
             location_last_seen= 'Around G block',
             date_lost=date.today()
@@ -184,10 +255,12 @@ class PrivateItemAPITests(TestCase):
         res = self.client.put(url,payload)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        item.refresh_from_db()
         for k, v in payload.items():
-            self.assertEqual(getattr(item, k), v)
-        self.assertEqual(item.user, self.user)
+            if isinstance(v, date):
+                v = v.isoformat()
+            self.assertEqual(res.data[k], v)
+        item = Item.objects.only('user_id').get(id=item.id)
+        self.assertEqual(item.user_id, self.user.id)
 
     def test_update_user_returns_error(self):
         """Test changing the recipe user results in an error"""
@@ -199,7 +272,7 @@ class PrivateItemAPITests(TestCase):
         self.client.patch(url, payload)
 
         item.refresh_from_db()
-        self.assertEqual(item.user, self.user)
+        self.assertEqual(item.user_id, self.user.id)
 
     def test_delete_item(self):
         """test deleting  an item successful"""
@@ -211,6 +284,20 @@ class PrivateItemAPITests(TestCase):
         self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
         self.assertFalse(Item.objects.filter(id=item.id).exists())
 
+    def test_delete_item_with_claims(self):
+        """Test deleting an item also deletes its claims"""
+        item = create_item(user=self.user)
+        claim = Claims.objects.create(
+            user=self.user,
+            item=item,
+            description='This is my item',
+        )
+
+        res = self.client.delete(detail_url(item.id))
+
+        self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(Claims.objects.filter(id=claim.id).exists())
+
     def test_item_other_users_item_error(self):
         """Test trying to delete another users items gives error"""
         new_user = create_user(email='user2@example.com',password='test123')
@@ -274,6 +361,72 @@ class PrivateItemAPITests(TestCase):
             ).exists()
             self.assertTrue(exists)
 
+    def test_create_item_with_repeated_tags(self):
+        """Test repeated tag names in a payload create a single tag"""
+        payload = {
+            'title': 'Lost keys',
+            'description': 'A bunch of keys',
+            'status': 'lost',
+            'category': 'accessories',
+            'location_last_seen': 'Around A block',
+            'date_lost': date.today(),
+            'tags': [{'name': 'keys'}, {'name': 'keys'}],
+        }
+        res = self.client.post(ITEMS_URL, payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        item = Item.objects.get(id=res.data['id'])
+        self.assertEqual(item.tags.count(), 1)
+        self.assertEqual(Tag.objects.filter(user=self.user).count(), 1)
+
+    def test_create_items_in_bulk(self):
+        """Test creating several items with one request"""
+        tag = Tag.objects.create(user=self.user, name='electronics')
+        payload = [
+            {
+                'title': 'Lost Samsung A22',
+                'description': 'A black samsung A22',
+                'status': 'lost',
+                'category': 'electronics',
+                'location_last_seen': 'Around G block',
+                'date_lost': date.today(),
+                'tags': [{'name': 'electronics'}, {'name': 'phone'}],
+            },
+            {
+                'title': 'Lost umbrella',
+                'description': 'A blue umbrella',
+                'status': 'lost',
+                'category': 'accessories',
+                'location_last_seen': 'Around C block',
+                'date_lost': date.today(),
+            },
+        ]
+        res = self.client.post(ITEMS_URL, payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(res.data), 2)
+        items = Item.objects.filter(user=self.user).order_by('id')
+        self.assertEqual(
+            [item.title for item in items],
+            [item['title'] for item in payload],
+        )
+        self.assertIn(tag, items[0].tags.all())
+        self.assertEqual(items[0].tags.count(), 2)
+        self.assertEqual(items[1].tags.count(), 0)
+        self.assertEqual(res.data[0]['id'], items[0].id)
+        self.assertEqual(len(res.data[0]['tags']), 2)
+
+    def test_partial_update_with_list_rejected(self):
+        """Test a list payload is rejected when updating one item"""
+        item = create_item(user=self.user, title='Lost Item')
+
+        payload = [{'title': 'New title'}]
+        res = self.client.patch(detail_url(item.id), payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        item.refresh_from_db()
+        self.assertEqual(item.title, 'Lost Item')
+
     def test_create_tag_on_update(self):
         """Test creating tag when updating a recipe."""
         item = create_item(user=self.user)
@@ -301,6 +454,20 @@ class PrivateItemAPITests(TestCase):
         self.assertIn(tag_jewellry, item.tags.all())
         self.assertNotIn(tag_electronics, item.tags.all())
 
+    def test_update_item_same_tags_no_writes(self):
+        """Test resending an item's tags leaves its tag links untouched"""
+        tag = Tag.objects.create(user=self.user, name='Electronics')
+        item = create_item(user=self.user)
+        item.tags.add(tag)
+
+        payload = {'tags': [{'name': 'Electronics'}]}
+        url = detail_url(item.id)
+        with self.assertNumQueries(4):
+            res = self.client.patch(url, payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(list(item.tags.all()), [tag])
+
     def test_clear_item_tags(self):
         """Test clearing an item tags"""
         tag = Tag.objects.create(user=self.user, name="Dessert")
@@ -316,13 +483,15 @@ class PrivateItemAPITests(TestCase):
 
     def test_filter_by_tags(self):
         """Test filtering items by tags"""
-        item1 = create_item(user=self.user,title= 'Samsung A12')
-        item2 = create_item(user=self.user, title='Iphone 16')
-        tag1 = Tag.objects.create(user=self.user, name='Electronics')
-        tag2 = Tag.objects.create(user=self.user,name='Iphone')
-        item1.tags.add(tag1)
-        item2.tags.add(tag2)
-        item3 = create_item(user=self.user, title='Fish and chips')
+        item1, item2, item3 = create_items(user=self.user, n=3)
+        tag1, tag2 = Tag.objects.bulk_create([
+            Tag(user=self.user, name='Electronics'),
+            Tag(user=self.user, name='Iphone'),
+        ])
+        Item.tags.through.objects.bulk_create([
+            Item.tags.through(item_id=item1.id, tag_id=tag1.id),
+            Item.tags.through(item_id=item2.id, tag_id=tag2.id),
+        ])
 
         params = {'tags': f'{tag1.id}, {tag2.id}'}
         res = self.client.get(ITEMS_URL, params)
@@ -334,22 +503,40 @@ class PrivateItemAPITests(TestCase):
         self.assertIn(s2.data, res.data)
         self.assertNotIn(s3.data, res.data)
 
+    def test_filter_by_tags_unique(self):
+        """Test filtering by several tags of one item lists it once"""
+        item = create_item(user=self.user)
+        tag1 = Tag.objects.create(user=self.user, name='Electronics')
+        tag2 = Tag.objects.create(user=self.user, name='Iphone')
+        item.tags.add(tag1, tag2)
+
+        params = {'tags': f'{tag1.id},{tag2.id},'}
+        res = self.client.get(ITEMS_URL, params)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual([i['id'] for i in res.data], [item.id])
 
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp())
 class ImageUploadTest(TestCase):
     """Tests for the image upload API"""
 
-    def setUp(self):
-        self.client = APIClient()
-        self.user = get_user_model().objects.create_user(
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
             'user@example.com',
             'password123',
         )
-        self.client.force_authenticate(self.user)
-        self.item = create_item(user=self.user)
+        cls.item = create_item(user=cls.user)
 
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
 
-    def tearDown(self):
-        self.item.image.delete()
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(settings.MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
 
     def test_upload_image(self):
         """Test for uploading an image to an item"""
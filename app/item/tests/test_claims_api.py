@@ -1,10 +1,11 @@
 """
 Test for the claims API
 """
-from difflib import SequenceMatcher
+from functools import lru_cache
 
 from django.contrib.auth import get_user_model
-from django.urls import reverse
+from django.db.models.functions import Lower
+from django.urls import reverse, reverse_lazy
 from django.test import TestCase
 from datetime import date
 
@@ -15,27 +16,16 @@ from core.models import(
     Claims,
     Item,
 )
+from item.matching import match_claim_to_item
 from item.serializers import ClaimsSerializer
 
 
-def match_claim_to_item(claim,items):
-    """Match claim to item based on description"""
-    best_match = None
-    best_ratio = 0
-
-    for item in items:
-        ratio = SequenceMatcher(None,claim.description.lower(),
-                item.description.lower()).ratio()
-        if ratio > best_ratio and ratio > 0.6:
-            best_ratio = ratio
-            best_match = item
-
-    return best_match
-
 def create_user(email='user@example.com', password='testpass123'):
     """Create and return a user"""
     return get_user_model().objects.create_user(email=email, password=password)
 
+
+@lru_cache(maxsize=None)
 def detail_url(item_id):
     """Create and Return a recipe detail URL"""
     return reverse('item:item-detail', args=[item_id])
@@ -45,7 +35,7 @@ def create_item(user, **params):
     defaults = {
         'title': 'Item name',
         'description': 'A simple description',
-        'status': 'lost',
+        'status': Item.Status.LOST,
         'category': 'Unknown',
         'location_last_seen': 'Unknown',
         'date_lost': date.today(),
@@ -67,7 +57,7 @@ def create_claim(user, **params):
     claim = Claims.objects.create(user=user, **defaults)
     return claim
 
-CLAIMS_URL = reverse('item:claims-list')
+CLAIMS_URL = reverse_lazy('item:claims-list')
 
 
 class PublicClaimsApiTest(TestCase):
@@ -86,8 +76,11 @@ class PublicClaimsApiTest(TestCase):
 class PrivateApiTests(TestCase):
     """Test unauthorized API requests."""
 
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user()
+
     def setUp(self):
-        self.user = create_user()
         self.client = APIClient()
         self.client.force_authenticate(self.user)
 
@@ -98,7 +91,6 @@ class PrivateApiTests(TestCase):
         admin_user.save()
         claim1 = create_claim(user=self.user)
         claim2 = create_claim(user=self.user)
-        self.client = APIClient()
         self.client.force_authenticate(user=admin_user)
         res = self.client.get(CLAIMS_URL)
         claims = [claim2, claim1]  # Assuming claims are ordered by ID
@@ -108,12 +100,22 @@ class PrivateApiTests(TestCase):
             self.assertEqual(res.data[i]['description'], claim.description)
             self.assertEqual(res.data[i]['user'], claim.user.id)
 
+    def test_retrieve_claims_items_joined(self):
+        """Test listing claims does not query each claim's item"""
+        for _ in range(3):
+            create_claim(user=self.user)
+
+        with self.assertNumQueries(1):
+            res = self.client.get(CLAIMS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data), 3)
+
     def test_claim_list_limited_to_user(self):
         """Test list of claims is limited to authenticated user"""
         other_user = create_user(email="other@example.com", password='test123')
         create_claim(user=other_user)
         create_claim(user=self.user)
-        self.client = APIClient()
         self.client.force_authenticate(user=self.user)
         res = self.client.get(CLAIMS_URL)
         claims = Claims.objects.filter(user=self.user)
@@ -129,21 +131,66 @@ class PrivateApiTests(TestCase):
             'testuser',
             'testpass123'
         )
-        self.client = APIClient()
         self.client.force_authenticate(user=self.user)
         item = create_item(user=user, title='Sample Item')
         payload = {
-            'item': item.title,
+            'item': item.id,
             'description': 'This is a test claim',
         }
         res = self.client.post(CLAIMS_URL, payload)
         self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(res.data['item_title'], item.title)
         claim = Claims.objects.get(id=res.data['id'])
-        self.assertEqual(claim.item.title, payload['item'])
+        self.assertEqual(claim.item.id, payload['item'])
         self.assertEqual(claim.description, payload['description'])
         self.assertEqual(claim.user, self.user)
         self.assertEqual(claim.status, 'pending')
 
+    def test_create_claim_matched_to_item(self):
+        """Test a new claim is linked to the item its description matches"""
+        item1 = create_item(
+            user=self.user,
+            title='Blue umbrella',
+            description='A blue umbrella with a wooden handle',
+        )
+        item2 = create_item(
+            user=self.user,
+            title='Oppo A22',
+            description='A black oppo A22 with cracked screen',
+        )
+        payload = {
+            'item': item1.id,
+            'description': 'Black oppo A22 cracked screen found',
+        }
+        res = self.client.post(CLAIMS_URL, payload)
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(res.data['item_title'], item2.title)
+        claim = Claims.objects.get(id=res.data['id'])
+        self.assertEqual(claim.item_id, item2.id)
+
+    def test_create_claim_matched_despite_typos(self):
+        """Test a misspelt claim still reaches the fuzzy matcher"""
+        item1 = create_item(
+            user=self.user,
+            title='Blue umbrella',
+            description='A blue umbrella with a wooden handle',
+        )
+        item2 = create_item(
+            user=self.user,
+            title='Black iphone',
+            description='Black iphone with cracked screen',
+        )
+        payload = {
+            'item': item1.id,
+            'description': 'blakc ipohne wtih carcked sreecn',
+        }
+        res = self.client.post(CLAIMS_URL, payload)
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(res.data['item_title'], item2.title)
+        claim = Claims.objects.get(id=res.data['id'])
+        self.assertEqual(claim.item_id, item2.id)
 
     def test_update_claim_status_admin(self):
         """Test for only admin can update status of claim"""
@@ -152,11 +199,10 @@ class PrivateApiTests(TestCase):
         admin_user.save()
         claim = create_claim(user=self.user)
 
-        self.client = APIClient()
         self.client.force_authenticate(user=admin_user)
 
         payload = {'status': 'approved'}
-        res = self.client.patch(f'{ CLAIMS_URL}{claim.id}/', payload)
+        res = self.client.patch(f'{CLAIMS_URL}{claim.id}/', payload)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
         claim.refresh_from_db()
@@ -175,8 +221,11 @@ class PrivateApiTests(TestCase):
         item1 = create_item(user=self.user, description='A black oppo A22 with cracked screen')
         item2 = create_item(self.user, description='A white Iphone 13 with no issues')
         claim = create_claim(user=self.user, description='Black oppo A22 cracked screen found')
+        claim = Claims.objects.annotate(
+            description_lc=Lower('description'),
+        ).get(id=claim.id)
 
-        items= Item.objects.all()
+        items = Item.objects.annotate(description_lc=Lower('description'))
         matched_item = match_claim_to_item(claim,items)
 
         self.assertEqual(matched_item.id, item1.id)
@@ -191,6 +240,18 @@ class PrivateApiTests(TestCase):
         exists = Claims.objects.filter(id=claim.id).exists()
         self.assertFalse(exists)
 
+    def test_update_own_claim_user_not_loaded(self):
+        """Test the owner check on a claim does not load its user"""
+        claim = create_claim(user=self.user)
+        payload = {'description': 'It has a blue case'}
+
+        with self.assertNumQueries(2):
+            res = self.client.patch(f'{CLAIMS_URL}{claim.id}/', payload)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        claim.refresh_from_db()
+        self.assertEqual(claim.description, payload['description'])
+
     def test_delete_other_user_claim(self):
         """Test deleting other user's claim"""
         other_user = create_user(email='other@example.com', password='test123')
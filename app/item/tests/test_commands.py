@@ -0,0 +1,66 @@
+"""
+Test item management commands.
+"""
+from datetime import date
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+
+from core.models import Claims, Item
+
+
+class RematchClaimsCommandTests(TestCase):
+    """Test the rematch_claims command."""
+
+    def setUp(self):
+        user = get_user_model().objects.create_user(
+            'user@example.com',
+            'testpass123',
+        )
+        self.item1, self.item2 = Item.objects.bulk_create([
+            Item(
+                user=user,
+                title=title,
+                description=description,
+                category='electronics',
+                location_last_seen='C-Block',
+                date_lost=date.today(),
+            )
+            for title, description in [
+                ('Umbrella', 'A blue umbrella with a wooden handle'),
+                ('Phone', 'A black oppo A22 with cracked screen'),
+            ]
+        ])
+        self.claim = Claims.objects.create(
+            user=user,
+            item=self.item1,
+            description='Black oppo A22 cracked screen found',
+        )
+        self.approved = Claims.objects.create(
+            user=user,
+            item=self.item1,
+            status='approved',
+            description='Black oppo A22 cracked screen found',
+        )
+
+    def test_rematch_pending_claims(self):
+        """Test pending claims are relinked to their best item."""
+        call_command('rematch_claims')
+
+        self.claim.refresh_from_db()
+        self.approved.refresh_from_db()
+        self.assertEqual(self.claim.item_id, self.item2.id)
+        self.assertEqual(self.approved.item_id, self.item1.id)
+
+    def test_rematch_ties_go_to_oldest_item(self):
+        """Test equally good items resolve to the lowest id."""
+        self.item1.description = self.item2.description
+        self.item1.save()
+        self.claim.item = self.item2
+        self.claim.save()
+
+        call_command('rematch_claims')
+
+        self.claim.refresh_from_db()
+        self.assertEqual(self.claim.item_id, self.item1.id)
@@ -2,8 +2,10 @@
 Tests for the tags API
 """
 from datetime import date
+from functools import lru_cache
+
 from django.contrib.auth import get_user_model
-from django.urls import reverse
+from django.urls import reverse, reverse_lazy
 from django.test import TestCase
 
 from rest_framework import status
@@ -17,8 +19,10 @@ from core.models import (
 from item.serializers import TagSerializer
 
 
-TAGS_URL = reverse('item:tag-list')
+TAGS_URL = reverse_lazy('item:tag-list')
+
 
+@lru_cache(maxsize=None)
 def detail_url(tag_id):
     """Create and return a tag detail url"""
     return reverse('item:tag-detail',args=[tag_id])
@@ -45,15 +49,20 @@ class PublicTagsApiTests(TestCase):
 class PrivateApiTests(TestCase):
     """Test authenticated API requests."""
 
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user()
+
     def setUp(self):
-        self.user = create_user()
         self.client = APIClient()
         self.client.force_authenticate(self.user)
 
     def test_retrieve_tags(self):
         """Test retrieving a list of tags"""
-        Tag.objects.create(user=self.user, name='Lost Phone')
-        Tag.objects.create(user=self.user, name='Electronics')
+        Tag.objects.bulk_create([
+            Tag(user=self.user, name='Lost Phone'),
+            Tag(user=self.user, name='Electronics'),
+        ])
 
         res = self.client.get(TAGS_URL)
 
@@ -87,6 +96,19 @@ class PrivateApiTests(TestCase):
         tag.refresh_from_db()
         self.assertEqual(tag.name, payload['name'])
 
+    def test_update_tag_existing_name_error(self):
+        """Test renaming a tag to an existing tag name returns an error"""
+        Tag.objects.create(user=self.user, name='Phones')
+        tag = Tag.objects.create(user=self.user, name='Wallet')
+
+        payload = {'name': 'Phones'}
+        url = detail_url(tag.id)
+        res = self.client.patch(url, payload)
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        tag.refresh_from_db()
+        self.assertEqual(tag.name, 'Wallet')
+
     def test_delete_tag(self):
         """test deleting a tag"""
         tag = Tag.objects.create(user=self.user, name='Scarf')
@@ -100,12 +122,14 @@ class PrivateApiTests(TestCase):
 
     def test_filter_tags_assigned_to_items(self):
         """test listing tags to those assigned to items"""
-        tag1=Tag.objects.create(user=self.user, name='Ring')
-        tag2=Tag.objects.create(user=self.user, name='Stanley cup')
+        tag1, tag2 = Tag.objects.bulk_create([
+            Tag(user=self.user, name='Ring'),
+            Tag(user=self.user, name='Stanley cup'),
+        ])
         item = Item.objects.create(
             title='missing earbuds',
             description='lost earbuds',
-            status='found',
+            status=Item.Status.FOUND,
             category='electronics',
             location_last_seen='Around C block',
             date_lost=date.today(),
@@ -122,28 +146,31 @@ class PrivateApiTests(TestCase):
 
     def test_filtered_tags_unique(self):
         """test filtered tags returns a unique list"""
-        tag = Tag.objects.create(user=self.user, name='Accessories')
-        Tag.objects.create(user=self.user, name='Samsung')
-        item1 = Item.objects.create(
-            title='missing earbuds',
-            description='lost earbuds',
-            status='found',
-            category='electronics',
-            location_last_seen='Around C block',
-            date_lost=date.today(),
-            user=self.user,
-        )
-        item2=Item.objects.create(
-            title='Samsung S25',
-            description='lost samsung phone',
-            status='lost',
-            category='electronics',
-            location_last_seen='Around Bush Canteen',
-            date_lost= date.today(),
-            user=self.user,
-        )
-        item1.tags.add(tag)
-        item2.tags.add(tag)
+        tag, _ = Tag.objects.bulk_create([
+            Tag(user=self.user, name='Accessories'),
+            Tag(user=self.user, name='Samsung'),
+        ])
+        item1, item2 = Item.objects.bulk_create([
+            Item(
+                title='missing earbuds',
+                description='lost earbuds',
+                status=Item.Status.FOUND,
+                category='electronics',
+                location_last_seen='Around C block',
+                date_lost=date.today(),
+                user=self.user,
+            ),
+            Item(
+                title='Samsung S25',
+                description='lost samsung phone',
+                status=Item.Status.LOST,
+                category='electronics',
+                location_last_seen='Around Bush Canteen',
+                date_lost=date.today(),
+                user=self.user,
+            ),
+        ])
+        tag.item_set.add(item1, item2)
 
         res = self.client.get(TAGS_URL, {'assigned_only': 1})
 
@@ -7,7 +7,11 @@ from drf_spectacular.utils import (
     OpenApiParameter,
     OpenApiTypes,
 )
-from difflib import SequenceMatcher
+from collections import defaultdict
+from django.contrib.postgres.search import TrigramSimilarity
+from django.db import connection, transaction
+from django.db.models import Prefetch, Value
+from django.db.models.functions import Lower
 from rest_framework import (
     viewsets,
     mixins,
@@ -25,20 +29,13 @@ from core.models import (
     Claims,
 )
 from item import serializers
+from item.matching import match_claim_to_item
 
-def match_claim_to_item(claim,items):
-    """Match claim to item based on description"""
-    best_match = None
-    best_ratio = 0
+# Trigram-similar items shortlisted for fuzzy matching against a claim.
+CLAIM_MATCH_CANDIDATES = 20
+# Minimum trigram similarity for the shortlist; pg_trgm defaults to 0.3.
+CLAIM_MATCH_THRESHOLD = 0.2
 
-    for item in items:
-        ratio = SequenceMatcher(None,claim.description.lower(),
-                item.description.lower()).ratio()
-        if ratio > best_ratio and ratio > 0.6:
-            best_ratio = ratio
-            best_match = item
-
-    return best_match
 
 @extend_schema_view(
     list=extend_schema(
@@ -62,18 +59,24 @@ class ItemViewSet(viewsets.ModelViewSet):
 
     def _params_to_ints(self, qs):
         """Convert a list to strings to integers."""
-        return [int(str_id) for str_id in qs.split(',')]
+        return [int(str_id) for str_id in qs.split(',') if str_id.strip()]
+
     def get_queryset(self):
         """Retrieve items for authenticated user"""
+        queryset = self.queryset.filter(user_id=self.request.user.id)
+        if self.action == 'upload_image':
+            return queryset.only('id', 'image')
+        if self.action == 'destroy':
+            return queryset.only('id')
+
         tags = self.request.query_params.get('tags')
-        queryset = self.queryset
         if tags:
             tags_ids = self._params_to_ints(tags)
-            queryset = queryset.filter(tags__id__in=tags_ids)
+            queryset = queryset.filter(tags__id__in=tags_ids).distinct()
 
-        return queryset.filter(
-            user=self.request.user
-        ).order_by('-id').distinct()
+        return queryset.order_by('-id').prefetch_related(
+            Prefetch('tags', queryset=Tag.objects.only('id', 'name'))
+        )
 
     def get_serializer_class(self):
         """Return the serializer class for request"""
@@ -84,6 +87,49 @@ class ItemViewSet(viewsets.ModelViewSet):
 
         return self.serializer_class
 
+    def list(self, request, *args, **kwargs):
+        """List items from plain rows instead of model instances.
+
+        Skips building an Item per row and the serializer's per-attribute
+        lookups; tags are gathered from the through table in one query.
+        Scalar values still go through the ItemSerializer fields, so any
+        new list field must be a plain column on Item.
+        """
+        fields = self.get_serializer().fields
+        columns = [name for name in fields if name != 'tags']
+        queryset = self.filter_queryset(self.get_queryset())
+        rows = queryset.prefetch_related(None).values(*columns)
+        page = self.paginate_queryset(rows)
+        rows = list(rows if page is None else page)
+
+        item_tags = defaultdict(list)
+        if rows:
+            links = Item.tags.through.objects.filter(
+                item_id__in=[row['id'] for row in rows],
+            ).values_list('item_id', 'tag_id', 'tag__name')
+            for item_id, tag_id, tag_name in links:
+                item_tags[item_id].append({'id': tag_id, 'name': tag_name})
+
+        data = []
+        for row in rows:
+            item = {
+                name: fields[name].to_representation(row[name])
+                for name in columns
+            }
+            item['tags'] = item_tags[row['id']]
+            data.append(item)
+
+        if page is not None:
+            return self.get_paginated_response(data)
+        return Response(data)
+
+    def get_serializer(self, *args, **kwargs):
+        """Accept a list of items on create"""
+        if self.action == 'create' and isinstance(kwargs.get('data'), list):
+            kwargs['many'] = True
+
+        return super().get_serializer(*args, **kwargs)
+
     def perform_create(self, serializer):
         """Create a new Item"""
         serializer.save(user=self.request.user)
@@ -127,11 +173,11 @@ class BasicItemAPIAttrViewSet(
         )
         queryset = self.queryset
         if assigned_only:
-            queryset = queryset.filter(item__isnull=False)
+            queryset = queryset.filter(item__isnull=False).distinct()
 
         return queryset.filter(
-            user=self.request.user
-        ).order_by('-name').distinct()
+            user_id=self.request.user.id
+        ).order_by('-name')
 
 
 class TagViewSet(BasicItemAPIAttrViewSet):
@@ -145,24 +191,41 @@ class IsOwnerOrAdmin(permissions.BasePermission):
     def has_object_permission(self, request, view, obj):
         if request.user.is_staff:
             return True
-        return obj.user == request.user
+        return obj.user_id == request.user.id
 
 class ClaimsViewSet(BasicItemAPIAttrViewSet, mixins.CreateModelMixin):
     queryset = Claims.objects.none()
     serializer_class = serializers.ClaimsSerializer
 
     def get_queryset(self):
+        queryset = Claims.objects.select_related('item')
         if self.request.user.is_staff:
-            return Claims.objects.all()
-        return Claims.objects.filter(user=self.request.user)
+            return queryset
+        return queryset.filter(user_id=self.request.user.id)
 
     def perform_create(self, serializer):
         claim = serializer.save(user=self.request.user)
-        items = Item.objects.all()
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(
+                'SET LOCAL pg_trgm.similarity_threshold = %s',
+                [CLAIM_MATCH_THRESHOLD],
+            )
+            items = list(Item.objects.filter(
+                description__trigram_similar=claim.description,
+            ).only('id', 'title').annotate(
+                similarity=TrigramSimilarity('description', claim.description),
+                description_lc=Lower('description'),
+                claim_description_lc=Lower(Value(claim.description)),
+            ).order_by('-similarity')[:CLAIM_MATCH_CANDIDATES])
+        if not items:
+            return
+
+        # Lowercased by Postgres alongside the items, as rematch_claims does.
+        claim.description_lc = items[0].claim_description_lc
         matched_item = match_claim_to_item(claim, items)
         if matched_item:
+            Claims.objects.filter(pk=claim.pk).update(item=matched_item)
             claim.item = matched_item
-            claim.save()
 
     def get_permissions(self):
         if self.action in ['update', 'destroy']:
@@ -3,15 +3,15 @@ Tests for the user API
 """
 from django.test import TestCase
 from django.contrib.auth import get_user_model
-from django.urls import reverse
+from django.urls import reverse_lazy
 
 from rest_framework.test import APIClient
 from rest_framework import status
 
 
-CREATE_USER_URL = reverse('user:create')
-TOKEN_URL = reverse('user:token')
-ME_URL = reverse('user:me')
+CREATE_USER_URL = reverse_lazy('user:create')
+TOKEN_URL = reverse_lazy('user:token')
+ME_URL = reverse_lazy('user:me')
 
 def create_user(**params):
     """Create and return a new user"""